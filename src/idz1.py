@@ -9,8 +9,12 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from profiler import run_profiled
+from snapshot import load_snapshot, store_snapshot
 
 
 # Настройка логирования
@@ -35,12 +39,114 @@ class Route:
         return Route(start=data["start"], end=data["end"], number=data["number"])
 
 
+# Вид снимка файла маршрутов, разобранного в кортежи (начало, конец, номер).
+SNAPSHOT_KIND = "idz1-routes"
+
+
+def _parse_routes(data: bytes) -> List[Tuple[str, str, str]]:
+    """Разбор JSON файла маршрутов в компактный вид для снимка."""
+    return [(item["start"], item["end"], item["number"]) for item in json.loads(data.decode("utf-8"))]
+
+
+# Наибольшее число ответов, хранимых в каждом кэше графа маршрутов.
+GRAPH_CACHE_SIZE = 4096
+
+
+def _remember(cache: OrderedDict, key: Any, value: Any) -> None:
+    cache[key] = value
+    if len(cache) > GRAPH_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+class RouteGraph:
+    """Ориентированный граф остановок, рёбрами которого являются маршруты."""
+
+    def __init__(self, routes: Iterable[Route] = ()):
+        self.adjacency: Dict[str, List[Route]] = {}
+        self.touching: Dict[str, List[Route]] = {}
+        # Кэшируются неизменяемые значения, чтобы вызывающий код не мог их испортить.
+        # Размер кэшей ограничен: при переполнении вытесняется давно не запрошенный ответ.
+        self._reachable_cache: OrderedDict[str, FrozenSet[str]] = OrderedDict()
+        self._path_cache: OrderedDict[Tuple[str, str], Optional[Tuple[Route, ...]]] = OrderedDict()
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route) -> None:
+        """Добавление маршрута в граф со сбросом кэша запросов."""
+        self.adjacency.setdefault(route.start, []).append(route)
+        self.adjacency.setdefault(route.end, [])
+        self.touching.setdefault(route.start, []).append(route)
+        if route.end != route.start:
+            self.touching.setdefault(route.end, []).append(route)
+        self._reachable_cache.clear()
+        self._path_cache.clear()
+
+    def routes_at(self, stop: str) -> List[Route]:
+        """Все маршруты, начинающиеся или заканчивающиеся в остановке."""
+        return list(self.touching.get(stop, []))
+
+    def reachable(self, stop: str) -> FrozenSet[str]:
+        """Множество остановок, достижимых из заданной.
+
+        Сама остановка входит в результат, только если в неё можно вернуться.
+        """
+        cached = self._reachable_cache.get(stop)
+        if cached is not None:
+            self._reachable_cache.move_to_end(stop)
+            return cached
+        seen: Set[str] = set()
+        queue = deque([stop])
+        while queue:
+            for route in self.adjacency.get(queue.popleft(), []):
+                if route.end not in seen:
+                    seen.add(route.end)
+                    queue.append(route.end)
+        result = frozenset(seen)
+        _remember(self._reachable_cache, stop, result)
+        return result
+
+    def shortest_path(self, start: str, end: str) -> Optional[Tuple[Route, ...]]:
+        """Маршруты поездки с наименьшим числом пересадок (поиск в ширину)."""
+        key = (start, end)
+        if key in self._path_cache:
+            self._path_cache.move_to_end(key)
+            return self._path_cache[key]
+        result: Optional[Tuple[Route, ...]] = None
+        if start == end:
+            result = ()
+        elif start in self.adjacency:
+            came_by: Dict[str, Optional[Route]] = {start: None}
+            queue = deque([start])
+            while queue and end not in came_by:
+                for route in self.adjacency[queue.popleft()]:
+                    if route.end not in came_by:
+                        came_by[route.end] = route
+                        queue.append(route.end)
+            if end in came_by:
+                path = []
+                step = came_by[end]
+                while step is not None:
+                    path.append(step)
+                    step = came_by[step.start]
+                result = tuple(reversed(path))
+        _remember(self._path_cache, key, result)
+        return result
+
+
 class RouteManager:
     """Класс для управления маршрутами."""
 
     def __init__(self, file_path: Path):
         self.file_path = file_path
         self.routes: List[Route] = self._load_routes()
+        self._graph: Optional[RouteGraph] = None
+
+    @property
+    def graph(self) -> RouteGraph:
+        """Граф маршрутов, построенный при первом обращении и обновляемый при добавлении."""
+        if self._graph is None:
+            self._graph = RouteGraph(self.routes)
+        return self._graph
 
     def _load_routes(self) -> List[Route]:
         """Загрузка маршрутов из файла."""
@@ -48,10 +154,9 @@ class RouteManager:
             logging.warning("Файл с маршрутами не найден. Создан новый список.")
             return []
         try:
-            with open(self.file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                logging.info("Маршруты успешно загружены из файла.")
-                return [Route.from_dict(item) for item in data]
+            data = load_snapshot(self.file_path, _parse_routes, SNAPSHOT_KIND)
+            logging.info("Маршруты успешно загружены из файла.")
+            return [Route(start, end, number) for start, end, number in data]
         except (json.JSONDecodeError, Exception) as e:
             logging.error(f"Ошибка загрузки маршрутов: {e}")
             return []
@@ -62,6 +167,8 @@ class RouteManager:
             with open(self.file_path, "w", encoding="utf-8") as file:
                 json.dump([route.to_dict() for route in self.routes], file, ensure_ascii=False, indent=4)
             logging.info("Маршруты успешно сохранены.")
+            # Снимок обновляется сразу, чтобы следующий запуск не разбирал файл заново.
+            store_snapshot(self.file_path, [(r.start, r.end, r.number) for r in self.routes], SNAPSHOT_KIND)
         except Exception as e:
             logging.error(f"Ошибка сохранения маршрутов: {e}")
             raise
@@ -72,6 +179,8 @@ class RouteManager:
             raise ValueError("Номер маршрута должен быть числом.")
         new_route = Route(start, end, number)
         self.routes.append(new_route)
+        if self._graph is not None:
+            self._graph.add(new_route)
         logging.info(f"Добавлен маршрут: {new_route.to_dict()}")
 
     def find_route(self, number: str) -> Optional[Route]:
@@ -95,6 +204,8 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Управление маршрутами")
     parser.add_argument("--add", action="store_true", help="Добавить новый маршрут")
     parser.add_argument("--find", type=str, help="Найти маршрут по номеру")
+    parser.add_argument("--stop", type=str, help="Показать маршруты, проходящие через пункт")
+    parser.add_argument("--path", nargs=2, metavar=("START", "END"), help="Найти поездку с наименьшим числом пересадок")
     args = parser.parse_args()
 
     # Добавление нового маршрута
@@ -117,9 +228,25 @@ def main() -> None:
         else:
             print("Маршрут с таким номером не найден.")
 
-    # Сохранение маршрутов при выходе
-    manager.save_routes()
+    # Маршруты через пункт
+    if args.stop:
+        routes = manager.graph.routes_at(args.stop)
+        if routes:
+            for route in routes:
+                print(f"Маршрут {route.number}: {route.start} -> {route.end}")
+        else:
+            print("Через этот пункт маршруты не проходят.")
+
+    # Поиск поездки между пунктами
+    if args.path:
+        path = manager.graph.shortest_path(*args.path)
+        if path is None:
+            print("Пункт назначения недостижим.")
+        else:
+            for route in path:
+                print(f"Маршрут {route.number}: {route.start} -> {route.end}")
+            print(f"Пересадок: {max(len(path) - 1, 0)}")
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
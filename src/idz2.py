@@ -11,6 +11,9 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from profiler import run_profiled
+from snapshot import load_snapshot, store_snapshot
+
 
 # Настройка логирования без миллисекунд в формате
 logging.basicConfig(
@@ -21,6 +24,10 @@ logging.basicConfig(
 )
 
 
+# Вид снимка файла маршрутов, разобранного в список словарей.
+SNAPSHOT_KIND = "idz2-routes"
+
+
 class Logger:
     """Класс для логирования с миллисекундами."""
 
@@ -60,6 +67,8 @@ class RouteManager:
             with open(file_path, "w") as file:
                 json.dump(self.routes, file)
             Logger.log_with_millis(logging.INFO, "Данные маршрутов сохранены в файл.")
+            # Снимок обновляется сразу, чтобы следующий запуск не разбирал файл заново.
+            store_snapshot(file_path, self.routes, SNAPSHOT_KIND)
         except Exception as e:
             Logger.log_with_millis(logging.ERROR, f"Ошибка при сохранении данных: {e}")
             raise
@@ -72,8 +81,7 @@ class FileManager:
     def load_routes(file_path: Path) -> List[Dict[str, str]]:
         """Загрузить маршруты из файла."""
         try:
-            with open(file_path, "r") as file:
-                return json.load(file)
+            return load_snapshot(file_path, json.loads, SNAPSHOT_KIND)
         except FileNotFoundError:
             Logger.log_with_millis(logging.WARNING, "Файл с маршрутами не найден, создан новый список маршрутов.")
             return []
@@ -97,6 +105,7 @@ def main() -> None:
     parser.add_argument("--number", type=str, help="Номер маршрута для поиска")
 
     args = parser.parse_args()
+    changed = False
 
     if args.add:
         try:
@@ -104,6 +113,7 @@ def main() -> None:
             end = input("Введите конечный пункт маршрута: ")
             number = input("Введите номер маршрута: ")
             route_manager.add_route(start, end, number)
+            changed = True
         except ValueError as e:
             Logger.log_with_millis(logging.ERROR, f"Ошибка при добавлении маршрута: {e}")
             print(f"Ошибка: {e}")
@@ -116,11 +126,13 @@ def main() -> None:
         else:
             print("Маршрут с таким номером не найден.")
 
-    try:
-        route_manager.save_routes(file_path)
-    except Exception as e:
-        print(f"Ошибка при сохранении данных: {e}")
+    # Файл перезаписывается только при изменении маршрутов.
+    if changed:
+        try:
+            route_manager.save_routes(file_path)
+        except Exception as e:
+            print(f"Ошибка при сохранении данных: {e}")
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
@@ -3,12 +3,25 @@
 
 # для примера 2 лабораторной работы 9 добавьте возможность работы с исключениями и логгирование
 
+import argparse
+import bisect
+import heapq
+import io
 import logging
+import os
+import shlex
 import sys
 import xml.etree.ElementTree as ET
-from dataclasses import dataclass, field
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, replace
 from datetime import date
-from typing import List
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional
+from xml.sax.saxutils import escape
+
+from profiler import CommandTimer, run_profiled
+from snapshot import load_snapshot
 
 
 # Класс пользовательского исключения в случае, если неверно
@@ -42,6 +55,35 @@ class Worker:
     year: int
 
 
+def _parse_workers(data):
+    # Разбор XML в отсортированный по имени список кортежей для снимка.
+    xml = data.decode("utf8")
+    parser = ET.XMLParser(encoding="utf8")
+    tree = ET.fromstring(xml, parser=parser)
+    rows = []
+    for worker_element in tree:
+        name, post, year = None, None, None
+        for element in worker_element:
+            if element.tag == "name":
+                name = element.text
+            elif element.tag == "post":
+                post = element.text
+            elif element.tag == "year":
+                year = int(element.text)
+        if name is not None and post is not None and year is not None:
+            rows.append((name, post, year))
+    # Восстановить порядок по имени, на который опираются запросы.
+    rows.sort(key=lambda row: row[0])
+    return rows
+
+
+def _escape(text):
+    # Экранирование выполняется только для строк со спецсимволами XML.
+    if "&" in text or "<" in text or ">" in text:
+        return escape(text)
+    return text
+
+
 @dataclass
 class Staff:
     workers: List[Worker] = field(default_factory=lambda: [])
@@ -51,8 +93,9 @@ class Staff:
         today = date.today()
         if year < 0 or year > today.year:
             raise IllegalYearError(year)
-        self.workers.append(Worker(name=name, post=post, year=year))
-        self.workers.sort(key=lambda worker: worker.name)
+        # Список поддерживается отсортированным по имени, поэтому
+        # достаточно вставить работника в нужную позицию.
+        bisect.insort(self.workers, Worker(name=name, post=post, year=year), key=lambda worker: worker.name)
 
     def __str__(self):
         # Заголовок таблицы.
@@ -77,103 +120,448 @@ class Staff:
         return result
 
     def load(self, filename):
-        with open(filename, "r", encoding="utf8") as fin:
-            xml = fin.read()
-        parser = ET.XMLParser(encoding="utf8")
-        tree = ET.fromstring(xml, parser=parser)
-        self.workers = []
-        for worker_element in tree:
-            name, post, year = None, None, None
-            for element in worker_element:
-                if element.tag == "name":
-                    name = element.text
-                elif element.tag == "post":
-                    post = element.text
-                elif element.tag == "year":
-                    year = int(element.text)
-            if name is not None and post is not None and year is not None:
-                self.workers.append(Worker(name=name, post=post, year=year))
+        # Разобранный файл берется из снимка, если он не изменился.
+        rows = load_snapshot(Path(filename), _parse_workers, "primer1-staff")
+        self.workers = [Worker(name=name, post=post, year=year) for name, post, year in rows]
+
+    def add_many(self, rows):
+        # Пакетное добавление: одна сортировка вместо вставки каждого работника.
+        today = date.today()
+        workers = []
+        for name, post, year in rows:
+            if year < 0 or year > today.year:
+                raise IllegalYearError(year)
+            workers.append(Worker(name=name, post=post, year=year))
+        self.workers.extend(workers)
+        self.workers.sort(key=lambda worker: worker.name)
+
+    def query(self):
+        return StaffQuery(self)
 
     def save(self, filename):
-        root = ET.Element("workers")
-        for worker in self.workers:
-            worker_element = ET.Element("worker")
-            name_element = ET.SubElement(worker_element, "name")
-            name_element.text = worker.name
-            post_element = ET.SubElement(worker_element, "post")
-            post_element.text = worker.post
-            year_element = ET.SubElement(worker_element, "year")
-            year_element.text = str(worker.year)
-            root.append(worker_element)
-        tree = ET.ElementTree(root)
-        with open(filename, "wb") as fout:
-            tree.write(fout, encoding="utf8", xml_declaration=True)
+        # XML формируется напрямую, побайтно так же, как ElementTree.write,
+        # без построения дерева элементов для всех работников.
+        with open(filename, "w", encoding="utf8", newline="") as fout:
+            fout.write("<?xml version='1.0' encoding='utf8'?>\n")
+            if not self.workers:
+                fout.write("<workers />")
+                return
+            fout.write("<workers>")
+            fout.writelines(
+                f"<worker><name>{_escape(worker.name)}</name><post>{_escape(worker.post)}</post>"
+                f"<year>{worker.year}</year></worker>"
+                for worker in self.workers
+            )
+            fout.write("</workers>")
 
 
-if __name__ == "__main__":
-    # Выполнить настройку логгера.
-    logging.basicConfig(filename="workers.log", level=logging.INFO)
+# Поля, по которым допускается сортировка результатов запроса.
+ORDER_FIELDS = ("name", "post", "year")
+# Наибольший размер страницы (offset + limit), для которого сортировка выполняется кучей.
+HEAP_LIMIT = 1024
+
+
+@dataclass(frozen=True)
+class StaffQuery:
+    """Ленивый запрос к списку работников.
+
+    Каждый метод возвращает новый запрос, а результаты выдаются
+    генератором при итерации, без построения полного списка.
+    """
+
+    staff: Staff
+    post: Optional[str] = None
+    prefix: Optional[str] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    order: str = "name"
+    descending: bool = False
+    offset: int = 0
+    limit: Optional[int] = None
+
+    def where_post(self, post):
+        return replace(self, post=post)
+
+    def where_name(self, prefix):
+        return replace(self, prefix=prefix)
+
+    def where_year(self, year_from=None, year_to=None):
+        return replace(self, year_from=year_from, year_to=year_to)
+
+    def order_by(self, order, descending=False):
+        if order not in ORDER_FIELDS:
+            raise ValueError(f"Недопустимое поле сортировки: {order}")
+        return replace(self, order=order, descending=descending)
+
+    def skip(self, offset):
+        if offset < 0:
+            raise ValueError("Смещение не может быть отрицательным")
+        return replace(self, offset=offset)
+
+    def take(self, limit):
+        if limit < 0:
+            raise ValueError("Лимит не может быть отрицательным")
+        return replace(self, limit=limit)
+
+    def page(self, number, size):
+        # Страницы нумеруются с единицы.
+        return self.skip((number - 1) * size).take(size)
+
+    def _name_range(self):
+        # Границы просмотра списка, отсортированного по имени.
+        workers = self.staff.workers
+        if not self.prefix:
+            return 0, len(workers)
+        lo = bisect.bisect_left(workers, self.prefix, key=lambda worker: worker.name)
+        # Все имена с заданным префиксом меньше префикса, дополненного максимальным символом.
+        hi = bisect.bisect_left(workers, self.prefix + chr(0x10FFFF), key=lambda worker: worker.name)
+        return lo, hi
+
+    def _scan(self) -> Iterator[int]:
+        # Индексы подходящих работников в списке, упорядоченном по имени.
+        workers = self.staff.workers
+        lo, hi = self._name_range()
+        indexes = range(hi - 1, lo - 1, -1) if self.descending and self.order == "name" else range(lo, hi)
+        for idx in indexes:
+            worker = workers[idx]
+            if self.post is not None and worker.post != self.post:
+                continue
+            if self.year_from is not None and worker.year < self.year_from:
+                continue
+            if self.year_to is not None and worker.year > self.year_to:
+                continue
+            yield idx
+
+    def _ordered(self, stop: Optional[int]) -> Iterator[Worker]:
+        # Сортируются только ключи подходящих записей с индексами, а не сами работники.
+        # Для первых страниц достаточно кучи из offset + limit лучших ключей,
+        # для дальних страниц один проход сортировки быстрее кучи.
+        workers = self.staff.workers
+        order = self.order
+        keys = ((getattr(workers[idx], order), workers[idx].name, idx) for idx in self._scan())
+        if stop is None or stop > HEAP_LIMIT:
+            ordered = sorted(keys, reverse=self.descending)[:stop]
+        else:
+            select = heapq.nlargest if self.descending else heapq.nsmallest
+            ordered = select(stop, keys)
+        for key in ordered:
+            yield workers[key[2]]
+
+    def __iter__(self) -> Iterator[Worker]:
+        stop = None if self.limit is None else self.offset + self.limit
+        matched: Iterator[Worker]
+        if self.order == "name":
+            matched = (self.staff.workers[idx] for idx in self._scan())
+        else:
+            matched = self._ordered(stop)
+        return islice(matched, self.offset, stop)
+
+    def count(self):
+        return sum(1 for _ in self._scan())
+
+
+def parse_query(staff, args):
+    """Разбор аргументов команды query в запрос к работникам."""
+    query = staff.query()
+    for token in shlex.split(args):
+        if token == "desc":
+            query = query.order_by(query.order, descending=True)
+            continue
+        key, sep, value = token.partition("=")
+        if not sep:
+            raise ValueError(f"Некорректный параметр запроса: {token}")
+        if key == "post":
+            query = query.where_post(value)
+        elif key == "name":
+            query = query.where_name(value)
+        elif key == "year":
+            year_from, _, year_to = value.partition("-")
+            query = query.where_year(
+                int(year_from) if year_from else None,
+                int(year_to) if year_to else None,
+            )
+        elif key == "order":
+            query = query.order_by(value, descending=query.descending)
+        elif key == "limit":
+            query = query.take(int(value))
+        elif key == "offset":
+            query = query.skip(int(value))
+        else:
+            raise ValueError(f"Неизвестный параметр запроса: {key}")
+    return query
+
+
+# Замер времени команд, включается командой "profile on".
+timer = CommandTimer()
+
+
+def parse_add_args(args):
+    # Разбор строки "<ф.и.о.> <должность> <год>"; значения с пробелами
+    # берутся в кавычки, иначе два последних слова - должность и год.
+    parts = shlex.split(args) if '"' in args or "'" in args else args.rsplit(maxsplit=2)
+    if len(parts) != 3:
+        raise ValueError(f"Ожидалось: add <ф.и.о.> <должность> <год>, получено: {args}")
+    name, post, year = parts
+    return name, post, int(year)
+
+
+@timer.timed
+def add(staff, args):
+    if args:
+        name, post, year = parse_add_args(args)
+    else:
+        # Запросить данные о работнике.
+        name = input("Фамилия и инициалы? ")
+        post = input("Должность? ")
+        year = int(input("Год поступления? "))
+    # Добавить работника.
+    staff.add(name, post, year)
+    logging.info(f"Добавлен сотрудник: {name}, {post}, " f"поступивший в {year} году.")
+
+
+@timer.timed
+def show_list(staff, args):
+    # Вывести список.
+    print(staff)
+    logging.info("Отображен список сотрудников.")
+
+
+@timer.timed
+def select(staff, args):
+    period = int(args)
+    # Запросить работников.
+    selected = staff.select(period)
+    # Вывести результаты запроса.
+    if selected:
+        for idx, worker in enumerate(selected, 1):
+            print("{:>4}: {}".format(idx, worker.name))
+        logging.info(f"Найдено {len(selected)} работников со " f"стажем более {period} лет.")
+    else:
+        print("Работники с заданным стажем не найдены.")
+        logging.warning(f"Работники со стажем более {period} лет не найдены.")
+
+
+@timer.timed
+def query(staff, args):
+    selected = parse_query(staff, args)
+    found = 0
+    for idx, worker in enumerate(selected, selected.offset + 1):
+        print("{:>4}: {} ({}, {})".format(idx, worker.name, worker.post, worker.year))
+        found += 1
+    if found:
+        logging.info(f"Запрос вернул {found} работников.")
+    else:
+        print("Работники по запросу не найдены.")
+        logging.warning("Запрос не вернул ни одного работника.")
+
+
+@timer.timed
+def load(staff, args):
+    # Загрузить данные из файла.
+    staff.load(args)
+    logging.info(f"Загружены данные из файла {args}.")
+
+
+@timer.timed
+def save(staff, args):
+    # Сохранить данные в файл.
+    staff.save(args)
+    logging.info(f"Сохранены данные в файл {args}.")
+
+
+def profile(staff, args):
+    # Включить, выключить или показать замеры времени команд.
+    args = args.lower()
+    if args == "on":
+        timer.enabled = True
+        print("Замер времени команд включен.")
+    elif args == "off":
+        timer.enabled = False
+        print("Замер времени команд выключен.")
+    elif args == "show":
+        print(timer.report())
+    elif args == "reset":
+        timer.reset()
+    else:
+        raise UnknownCommandError(f"profile {args}")
+
+
+def show_help(staff, args):
+    # Вывести справку о работе с программой.
+    print("Список команд:\n")
+    print("add [<ф.и.о.> <должность> <год>] - добавить работника;")
+    print("list - вывести список работников;")
+    print("select <стаж> - запросить работников со стажем;")
+    print(
+        "query [post=<должность>] [name=<префикс>] [year=<от>-<до>] "
+        "[order=name|post|year] [desc] [offset=<N>] [limit=<N>] - постраничный запрос;"
+    )
+    print("load <имя_файла> - загрузить данные из файла;")
+    print("save <имя_файла> - сохранить данные в файл;")
+    print("profile on|off|show|reset - замер времени выполнения команд;")
+    print("checkpoint - в режиме сценария сохранить отложенные изменения;")
+    print("help - отобразить справку;")
+    print("exit - завершить работу с программой.")
+
+
+# Таблица команд: имя команды -> функция(staff, args).
+COMMANDS = {
+    "add": add,
+    "list": show_list,
+    "select": select,
+    "query": query,
+    "load": load,
+    "save": save,
+    "profile": profile,
+    "help": show_help,
+}
+
+
+def split_command(line):
+    # Имя команды приводится к нижнему регистру, аргументы остаются как есть.
+    parts = line.split(maxsplit=1)
+    if not parts:
+        return "", ""
+    return parts[0].lower(), parts[1] if len(parts) > 1 else ""
+
+
+def execute(staff, line):
+    name, args = split_command(line)
+    command = COMMANDS.get(name)
+    if command is None:
+        raise UnknownCommandError(line.lower())
+    command(staff, args)
+
+
+class ScriptRunner:
+    """Пакетное выполнение команд из файла или канала.
+
+    Подряд идущие команды add накапливаются и добавляются одной операцией,
+    а save откладывается до команды checkpoint, смены файла, загрузки или конца сценария.
+    """
+
+    def __init__(self, staff):
+        self.staff = staff
+        self.pending = []
+        self.save_path = None
+        self.save_line = 0
+        self.errors = 0
+        self.current_year = date.today().year
+
+    def report(self, number, exc):
+        self.errors += 1
+        logging.error(f"Ошибка в строке {number}: {exc}")
+        print(f"{number}: {exc}", file=sys.stderr)
+
+    def flush(self):
+        if self.pending:
+            self.staff.add_many(self.pending)
+            logging.info(f"Добавлено сотрудников: {len(self.pending)}.")
+            self.pending = []
+
+    def checkpoint(self):
+        # Ошибка отложенного сохранения относится к строке с командой save.
+        self.flush()
+        if self.save_path is not None:
+            path, self.save_path = self.save_path, None
+            try:
+                save(self.staff, path)
+            except Exception as exc:
+                self.report(self.save_line, exc)
+
+    def run(self, lines):
+        lines = iter(lines)
+        number = 0
+        for line in lines:
+            number += 1
+            try:
+                line = line.rstrip("\r\n")
+                name, args = split_command(line)
+                if not name:
+                    continue
+                if name == "add":
+                    if not args:
+                        # Данные работника заданы следующими тремя строками, как при вводе с клавиатуры.
+                        args = " ".join(shlex.quote(next(lines).rstrip("\r\n")) for _ in range(3))
+                        number += 3
+                    record = parse_add_args(args)
+                    if record[2] < 0 or record[2] > self.current_year:
+                        raise IllegalYearError(record[2])
+                    self.pending.append(record)
+                    continue
+                self.flush()
+                if name == "exit":
+                    break
+                elif name == "save":
+                    directory = Path(args).parent
+                    if not args or not directory.is_dir() or not os.access(directory, os.W_OK):
+                        raise ValueError(f"Нельзя сохранить данные в файл {args}: каталог недоступен для записи")
+                    if self.save_path is not None and self.save_path != args:
+                        # Смена файла: отложенное сохранение в прежний файл выполняется сразу.
+                        self.checkpoint()
+                    self.save_path = args
+                    self.save_line = number
+                elif name == "checkpoint":
+                    self.checkpoint()
+                else:
+                    if name == "load":
+                        # Загрузка заменяет список, поэтому отложенное сохранение выполняется до нее.
+                        self.checkpoint()
+                    execute(self.staff, line)
+            except Exception as exc:
+                self.report(number, exc)
+        self.checkpoint()
+        return self.errors
+
+
+def run_script(staff, lines):
+    """Выполнение сценария с буферизованным выводом, возвращает число ошибок."""
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # Поток без двоичного буфера (например, StringIO) используется как есть.
+        return ScriptRunner(staff).run(lines)
+    sys.stdout.flush()
+    stream = io.TextIOWrapper(buffer, encoding=sys.stdout.encoding or "utf-8", errors=sys.stdout.errors)
+    try:
+        with redirect_stdout(stream):
+            return ScriptRunner(staff).run(lines)
+    finally:
+        stream.flush()
+        stream.detach()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Учет сотрудников")
+    parser.add_argument("--script", help="Выполнить команды из файла")
+    options = parser.parse_args()
     staff = Staff()
 
+    # Сценарий из файла или из канала выполняется без приглашений.
+    if options.script:
+        with open(options.script, "r", encoding="utf-8") as fin:
+            errors = run_script(staff, fin)
+        sys.exit(1 if errors else 0)
+    if not sys.stdin.isatty():
+        sys.exit(1 if run_script(staff, sys.stdin) else 0)
+
     # Организовать бесконечный цикл запроса команд.
     while True:
         try:
             # Запросить команду из терминала.
-            command = input(">>> ").lower()
+            line = input(">>> ")
 
             # Выполнить действие в соответствие с командой.
-            if command == "exit":
+            if line.strip().lower() == "exit":
                 break
-            elif command == "add":
-                # Запросить данные о работнике.
-                name = input("Фамилия и инициалы? ")
-                post = input("Должность? ")
-                year = int(input("Год поступления? "))
-                # Добавить работника.
-                staff.add(name, post, year)
-                logging.info(f"Добавлен сотрудник: {name}, {post}, " f"поступивший в {year} году.")
-            elif command == "list":
-                # Вывести список.
-                print(staff)
-                logging.info("Отображен список сотрудников.")
-            elif command.startswith("select "):
-                # Разбить команду на части для выделения номера года.
-                parts = command.split(maxsplit=1)
-                period = int(parts[1])
-                # Запросить работников.
-                selected = staff.select(period)
-                # Вывести результаты запроса.
-                if selected:
-                    for idx, worker in enumerate(selected, 1):
-                        print("{:>4}: {}".format(idx, worker.name))
-                    logging.info(f"Найдено {len(selected)} работников со " f"стажем более {period} лет.")
-                else:
-                    print("Работники с заданным стажем не найдены.")
-                    logging.warning(f"Работники со стажем более {period} лет не найдены.")
-            elif command.startswith("load "):
-                # Разбить команду на части для имени файла.
-                parts = command.split(maxsplit=1)
-                # Загрузить данные из файла.
-                staff.load(parts[1])
-                logging.info(f"Загружены данные из файла {parts[1]}.")
-            elif command.startswith("save "):
-                # Разбить команду на части для имени файла.
-                parts = command.split(maxsplit=1)
-                # Сохранить данные в файл.
-                staff.save(parts[1])
-                logging.info(f"Сохранены данные в файл {parts[1]}.")
-            elif command == "help":
-                # Вывести справку о работе с программой.
-                print("Список команд:\n")
-                print("add - добавить работника;")
-                print("list - вывести список работников;")
-                print("select <стаж> - запросить работников со стажем;")
-                print("load <имя_файла> - загрузить данные из файла;")
-                print("save <имя_файла> - сохранить данные в файл;")
-                print("help - отобразить справку;")
-                print("exit - завершить работу с программой.")
-            else:
-                raise UnknownCommandError(command)
+            execute(staff, line)
+        except EOFError:
+            break
         except Exception as exc:
             logging.error(f"Ошибка: {exc}")
             print(exc, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    # Выполнить настройку логгера.
+    logging.basicConfig(filename="workers.log", level=logging.INFO)
+    run_profiled(main)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Профилирование консольных программ: флаг --profile или переменная окружения
+# LABA_PROFILE включают cProfile либо семплирующий профилировщик, а CommandTimer
+# замеряет время отдельных команд. В выключенном состоянии ничего не делает.
+
+from __future__ import annotations
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+
+PROFILE_ENV = "LABA_PROFILE"
+PROFILE_FLAG = "--profile"
+# Расширения файлов, которые принимаются как значение флага --profile.
+STATS_SUFFIXES = (".pstats", ".prof")
+FOLDED_SUFFIXES = (".folded", ".collapsed")
+
+T = TypeVar("T")
+
+
+def pop_profile_arg(argv: List[str]) -> Optional[str]:
+    """Извлечение флага --profile из аргументов командной строки.
+
+    Флаг удаляется, чтобы не мешать разбору остальных аргументов. Без значения
+    путь к файлу строится по имени программы.
+    """
+    for idx, arg in enumerate(argv):
+        if arg.startswith(PROFILE_FLAG + "="):
+            del argv[idx]
+            return arg.split("=", 1)[1]
+        if arg == PROFILE_FLAG:
+            del argv[idx]
+            if idx < len(argv) and argv[idx].endswith(STATS_SUFFIXES + FOLDED_SUFFIXES):
+                return argv.pop(idx)
+            return f"{Path(argv[0]).stem if argv else 'profile'}.pstats"
+    return None
+
+
+class SamplingProfiler:
+    """Семплирующий профилировщик, собирающий свернутые стеки потока."""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self) -> SamplingProfiler:
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._sampler.join()
+
+    def dump(self, path: str) -> None:
+        """Запись стеков в формате "стек количество" для flamegraph."""
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.samples.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def run_profiled(func: Callable[[], T], argv: Optional[List[str]] = None) -> T:
+    """Запуск функции с профилированием, если оно запрошено."""
+    path = pop_profile_arg(sys.argv if argv is None else argv) or os.environ.get(PROFILE_ENV)
+    if not path:
+        return func()
+    if path.endswith(FOLDED_SUFFIXES):
+        with SamplingProfiler() as sampler:
+            try:
+                return func()
+            finally:
+                sampler.dump(path)
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func)
+    finally:
+        profile.dump_stats(path)
+
+
+class CommandTimer:
+    """Замер времени выполнения команд, включаемый во время работы."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.stats: Dict[str, List[float]] = {}
+
+    def timed(self, func: Callable[..., T]) -> Callable[..., T]:
+        name = func.__name__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not self.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                # Количество вызовов, суммарное и максимальное время.
+                record = self.stats.setdefault(name, [0, 0.0, 0.0])
+                record[0] += 1
+                record[1] += elapsed
+                record[2] = max(record[2], elapsed)
+
+        return wrapper
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+    def report(self) -> str:
+        line = "+-{}-+-{}-+-{}-+-{}-+".format("-" * 20, "-" * 8, "-" * 12, "-" * 12)
+        table = [line, "| {:^20} | {:^8} | {:^12} | {:^12} |".format("Команда", "Вызовов", "Всего, мс", "Макс, мс")]
+        table.append(line)
+        for name, (count, total, longest) in sorted(self.stats.items(), key=lambda item: -item[1][1]):
+            table.append(
+                "| {:<20} | {:>8} | {:>12.3f} | {:>12.3f} |".format(name, int(count), total * 1000, longest * 1000)
+            )
+        table.append(line)
+        return "\n".join(table)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Общая для нескольких процессов таблица маршрутов. Маршруты упаковываются в
+# неизменяемый файл (индекс по номеру и строки в UTF-8), который процессы-читатели
+# отображают в память через mmap и используют без разбора JSON и без копирования.
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from idz1 import Route, RouteManager
+
+
+# Заголовок: сигнатура, версия формата, поколение таблицы, количество маршрутов.
+HEADER = struct.Struct("<4sIQI")
+MAGIC = b"RTSH"
+VERSION = 1
+# Запись индекса: смещение и длина номера, начального и конечного пунктов в блоке строк.
+ENTRY = struct.Struct("<IIIIII")
+
+
+def default_table_path() -> Path:
+    """Путь к таблице: в памяти (/dev/shm), если она доступна, иначе в домашнем каталоге."""
+    shm = Path("/dev/shm")
+    directory = shm if shm.is_dir() else Path.home()
+    return directory / "idz.routes"
+
+
+def _generation(path: Path) -> int:
+    try:
+        with open(path, "rb") as file:
+            magic, _, generation, _ = HEADER.unpack(file.read(HEADER.size))
+        return generation if magic == MAGIC else 0
+    except (OSError, struct.error):
+        return 0
+
+
+def publish_routes(routes: Iterable[Route], path: Path) -> int:
+    """Публикация маршрутов в виде упакованной таблицы, возвращает номер поколения.
+
+    Новая таблица записывается во временный файл и атомарно заменяет старую,
+    поэтому уже подключенные читатели продолжают работать со своим поколением.
+    """
+    path = Path(path)
+    generation = _generation(path) + 1
+    blob = bytearray()
+
+    def put(text: str) -> tuple[int, int]:
+        data = text.encode("utf-8")
+        offset = len(blob)
+        blob.extend(data)
+        return offset, len(data)
+
+    # Сортировка по номеру устойчива: при повторах первым остается добавленный раньше.
+    packed = sorted(
+        ((route.number.encode("utf-8"), idx, route) for idx, route in enumerate(routes)),
+        key=lambda item: (item[0], item[1]),
+    )
+    index = bytearray()
+    for _, _, route in packed:
+        index += ENTRY.pack(*put(route.number), *put(route.start), *put(route.end))
+
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, generation, len(packed)))
+        file.write(index)
+        file.write(blob)
+    os.replace(temp, path)
+    return generation
+
+
+class SharedRouteTable:
+    """Читатель опубликованной таблицы маршрутов."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._map: Optional[mmap.mmap] = None
+        self._attach()
+
+    def _attach(self) -> None:
+        with open(self.path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, generation, count = HEADER.unpack_from(table, 0)
+        if magic != MAGIC or version != VERSION:
+            table.close()
+            raise ValueError(f"Файл {self.path} не является таблицей маршрутов")
+        if self._map is not None:
+            self._map.close()
+        self._map = table
+        self._identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self.generation = generation
+        self.count = count
+        self._blob = HEADER.size + count * ENTRY.size
+
+    def refresh(self) -> bool:
+        """Переход на новое поколение таблицы, если она была опубликована заново."""
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self._identity:
+            return False
+        self._attach()
+        return True
+
+    def _text(self, offset: int, length: int) -> bytes:
+        assert self._map is not None
+        start = self._blob + offset
+        return self._map[start : start + length]
+
+    def _entry(self, idx: int) -> tuple[int, int, int, int, int, int]:
+        assert self._map is not None
+        return ENTRY.unpack_from(self._map, HEADER.size + idx * ENTRY.size)
+
+    def _route(self, entry: tuple[int, int, int, int, int, int]) -> Route:
+        number_off, number_len, start_off, start_len, end_off, end_len = entry
+        return Route(
+            start=self._text(start_off, start_len).decode("utf-8"),
+            end=self._text(end_off, end_len).decode("utf-8"),
+            number=self._text(number_off, number_len).decode("utf-8"),
+        )
+
+    def find_route(self, number: str) -> Optional[Route]:
+        """Поиск маршрута по номеру двоичным поиском по индексу."""
+        key = number.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(mid)
+            if self._text(entry[0], entry[1]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count:
+            entry = self._entry(lo)
+            if self._text(entry[0], entry[1]) == key:
+                return self._route(entry)
+        return None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Route]:
+        for idx in range(self.count):
+            yield self._route(self._entry(idx))
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> SharedRouteTable:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Общая таблица маршрутов для нескольких процессов")
+    parser.add_argument("--table", type=Path, default=default_table_path(), help="Файл таблицы маршрутов")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("publish", help="Опубликовать маршруты из ~/idz.json")
+    find_parser = subparsers.add_parser("find", help="Найти маршрут по номеру в таблице")
+    find_parser.add_argument("number", type=str, help="Номер маршрута")
+    args = parser.parse_args()
+
+    if args.command == "publish":
+        manager = RouteManager(Path.home() / "idz.json")
+        generation = publish_routes(manager.routes, args.table)
+        print(f"Опубликовано маршрутов: {len(manager.routes)}, поколение {generation}.")
+    else:
+        with SharedRouteTable(args.table) as table:
+            route = table.find_route(args.number)
+        if route:
+            print(f"Маршрут найден: Начало: {route.start}, Конец: {route.end}")
+        else:
+            print("Маршрут с таким номером не найден.")
+
+
+if __name__ == "__main__":
+    main()
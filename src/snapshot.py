@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Кэш разобранных данных JSON/XML файлов. Снимок хранится в каталоге рядом с
+# исходным файлом и используется повторно, пока файл не изменился.
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+# Версия формата снимка, при изменении формата старые снимки игнорируются.
+VERSION = 1
+CACHE_DIR_NAME = ".snapshot_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class SnapshotCache:
+    """Кэш снимков с проверкой пути, размера, времени изменения и хэша файла."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _directory(self, source: Path) -> Path:
+        return self.cache_dir if self.cache_dir is not None else source.parent / CACHE_DIR_NAME
+
+    def entry_path(self, source: Path, kind: str) -> Path:
+        """Путь к снимку для исходного файла и вида разбора kind."""
+        name = hashlib.sha1(f"{kind}\0{source.resolve()}".encode("utf-8")).hexdigest()
+        return self._directory(source) / f"{name}.snap"
+
+    @staticmethod
+    def _key(source: Path, data: bytes, kind: str) -> tuple:
+        stat = source.stat()
+        return (VERSION, kind, str(source.resolve()), stat.st_size, stat.st_mtime_ns, hashlib.blake2b(data).digest())
+
+    def load(self, source: Path, parse: Callable[[bytes], Any], kind: str) -> Any:
+        """Данные файла из снимка или результат parse, если снимок устарел.
+
+        Вид разбора kind разделяет снимки одного файла, разобранного разными способами.
+        """
+        source = Path(source)
+        data = source.read_bytes()
+        key = self._key(source, data, kind)
+
+        entry = self.entry_path(source, kind)
+        try:
+            stored_key, payload = marshal.loads(entry.read_bytes())
+            if stored_key == key:
+                # Время доступа к снимку используется при вытеснении.
+                os.utime(entry)
+                return payload
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Снимок {entry} поврежден и будет пересоздан: {e}")
+
+        payload = parse(data)
+        self._store(entry, key, payload)
+        return payload
+
+    def store(self, source: Path, payload: Any, kind: str) -> None:
+        """Обновление снимка уже известными данными, например сразу после записи файла."""
+        source = Path(source)
+        try:
+            data = source.read_bytes()
+        except OSError as e:
+            logging.warning(f"Не удалось обновить снимок для {source}: {e}")
+            return
+        self._store(self.entry_path(source, kind), self._key(source, data, kind), payload)
+
+    def _store(self, entry: Path, key: tuple, payload: Any) -> None:
+        try:
+            data = marshal.dumps((key, payload))
+            if len(data) > self.max_bytes:
+                # Снимок больше лимита не сохраняется, иначе он был бы сразу вытеснен.
+                entry.unlink(missing_ok=True)
+                return
+            entry.parent.mkdir(exist_ok=True)
+            temp = entry.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_bytes(data)
+            os.replace(temp, entry)
+            self._evict(entry.parent, keep=entry)
+        except (OSError, ValueError) as e:
+            # Кэш необязателен: ошибка записи снимка не мешает работе.
+            logging.warning(f"Не удалось сохранить снимок {entry}: {e}")
+
+    def _evict(self, directory: Path, keep: Path) -> None:
+        """Удаление давно не использованных снимков сверх лимита размера, кроме только что записанного."""
+        entries = []
+        total = 0
+        for path in directory.glob("*.snap"):
+            stat = path.stat()
+            total += stat.st_size
+            if path != keep:
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def invalidate(self, source: Path, kind: str) -> None:
+        self.entry_path(Path(source), kind).unlink(missing_ok=True)
+
+
+default_cache = SnapshotCache()
+
+
+def load_snapshot(source: Path, parse: Callable[[bytes], Any], kind: str) -> Any:
+    """Загрузка файла через общий кэш снимков."""
+    return default_cache.load(source, parse, kind)
+
+
+def store_snapshot(source: Path, payload: Any, kind: str) -> None:
+    """Обновление снимка в общем кэше после записи файла."""
+    default_cache.store(source, payload, kind)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Хранилище маршрутов и сотрудников во встроенной базе SQLite. Позволяет
+# добавлять и искать записи без полной загрузки и перезаписи JSON/XML файлов.
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sqlite3
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from idz1 import Route, RouteGraph
+from primer1 import IllegalYearError, Staff, Worker
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """Открытие базы данных в режиме журнала WAL."""
+    connection = sqlite3.connect(str(db_path))
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class SqliteRouteManager:
+    """Управление маршрутами, хранящимися в базе SQLite."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.connection = connect(db_path)
+        self._graph: Optional[RouteGraph] = None
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS routes ("
+                "id INTEGER PRIMARY KEY, start TEXT NOT NULL, end TEXT NOT NULL, number TEXT NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS routes_number ON routes (number)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS routes_start ON routes (start)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS routes_end ON routes (end)")
+
+    @property
+    def routes(self) -> List[Route]:
+        """Все маршруты в порядке добавления."""
+        rows = self.connection.execute("SELECT start, end, number FROM routes ORDER BY id")
+        return [Route(*row) for row in rows]
+
+    @property
+    def graph(self) -> RouteGraph:
+        """Граф маршрутов, построенный при первом обращении и обновляемый при добавлении."""
+        if self._graph is None:
+            self._graph = RouteGraph(self.routes)
+        return self._graph
+
+    def add_route(self, start: str, end: str, number: str) -> None:
+        """Добавление нового маршрута."""
+        if not number.isdigit():
+            raise ValueError("Номер маршрута должен быть числом.")
+        with self.connection:
+            self.connection.execute("INSERT INTO routes (start, end, number) VALUES (?, ?, ?)", (start, end, number))
+        if self._graph is not None:
+            self._graph.add(Route(start, end, number))
+        logging.info(f"Добавлен маршрут: {Route(start, end, number).to_dict()}")
+
+    def find_route(self, number: str) -> Optional[Route]:
+        """Поиск маршрута по номеру."""
+        row = self.connection.execute(
+            "SELECT start, end, number FROM routes WHERE number = ? ORDER BY id LIMIT 1", (number,)
+        ).fetchone()
+        if row is None:
+            logging.warning(f"Маршрут с номером {number} не найден.")
+            return None
+        route = Route(*row)
+        logging.info(f"Найден маршрут: {route.to_dict()}")
+        return route
+
+    def routes_at(self, stop: str) -> List[Route]:
+        """Маршруты, начинающиеся или заканчивающиеся в пункте."""
+        rows = self.connection.execute(
+            "SELECT start, end, number FROM routes WHERE start = ? OR end = ? ORDER BY id",
+            (stop, stop),
+        )
+        return [Route(*row) for row in rows]
+
+    def save_routes(self) -> None:
+        """Изменения фиксируются сразу, метод оставлен для совместимости с RouteManager."""
+        self.connection.commit()
+
+    def import_json(self, file_path: Path) -> int:
+        """Импорт маршрутов из JSON файла в формате idz1/idz2."""
+        with open(file_path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO routes (start, end, number) VALUES (?, ?, ?)",
+                ((item["start"], item["end"], item["number"]) for item in data),
+            )
+        if self._graph is not None:
+            for item in data:
+                self._graph.add(Route.from_dict(item))
+        logging.info(f"Импортировано {len(data)} маршрутов из файла {file_path}.")
+        return len(data)
+
+    def export_json(self, file_path: Path) -> None:
+        """Экспорт маршрутов в JSON файл в формате idz1/idz2."""
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump([route.to_dict() for route in self.routes], file, ensure_ascii=False, indent=4)
+        logging.info(f"Маршруты экспортированы в файл {file_path}.")
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class SqliteStaff:
+    """Список сотрудников, хранящийся в базе SQLite."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.connection = connect(db_path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS workers ("
+                "id INTEGER PRIMARY KEY, name TEXT NOT NULL, post TEXT NOT NULL, year INTEGER NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS workers_name ON workers (name, id)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS workers_year ON workers (year)")
+
+    @property
+    def workers(self) -> List[Worker]:
+        """Все сотрудники, упорядоченные по имени."""
+        rows = self.connection.execute("SELECT name, post, year FROM workers ORDER BY name, id")
+        return [Worker(*row) for row in rows]
+
+    def add(self, name, post, year):
+        today = date.today()
+        if year < 0 or year > today.year:
+            raise IllegalYearError(year)
+        with self.connection:
+            self.connection.execute("INSERT INTO workers (name, post, year) VALUES (?, ?, ?)", (name, post, year))
+
+    def select(self, period):
+        # Стаж не меньше period означает год поступления не позже текущего минус period.
+        today = date.today()
+        rows = self.connection.execute(
+            "SELECT name, post, year FROM workers WHERE year <= ? ORDER BY name, id", (today.year - period,)
+        )
+        return [Worker(*row) for row in rows]
+
+    def __str__(self):
+        return str(Staff(self.workers))
+
+    def import_xml(self, filename):
+        staff = Staff()
+        staff.load(filename)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO workers (name, post, year) VALUES (?, ?, ?)",
+                ((worker.name, worker.post, worker.year) for worker in staff.workers),
+            )
+        return len(staff.workers)
+
+    def export_xml(self, filename):
+        Staff(self.workers).save(filename)
+
+    def close(self):
+        self.connection.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Импорт и экспорт данных в базу SQLite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in (
+        ("import-routes", "Импортировать маршруты из JSON"),
+        ("export-routes", "Экспортировать маршруты в JSON"),
+        ("import-staff", "Импортировать сотрудников из XML"),
+        ("export-staff", "Экспортировать сотрудников в XML"),
+    ):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("db", type=Path, help="Файл базы данных")
+        subparser.add_argument("file", type=Path, help="Файл JSON или XML")
+    args = parser.parse_args()
+
+    if args.command.endswith("routes"):
+        manager = SqliteRouteManager(args.db)
+        if args.command == "import-routes":
+            print(f"Импортировано маршрутов: {manager.import_json(args.file)}")
+        else:
+            manager.export_json(args.file)
+        manager.close()
+    else:
+        staff = SqliteStaff(args.db)
+        if args.command == "import-staff":
+            print(f"Импортировано сотрудников: {staff.import_xml(args.file)}")
+        else:
+            staff.export_xml(args.file)
+        staff.close()
+
+
+if __name__ == "__main__":
+    main()
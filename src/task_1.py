@@ -6,6 +6,97 @@
 # выполняться конкатенация, т. е. соединение, строк. В остальных случаях
 # введенные числа суммируются.
 
+import argparse
+import sys
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, Optional, TextIO
+
+from profiler import run_profiled
+
+
+# Количество строк, обрабатываемых за один раз в пакетном режиме.
+CHUNK_SIZE = 65536
+
+
+def to_int(value: str) -> Optional[int]:
+    """Преобразование строки в число или None, если это не число."""
+    # Дешевая проверка до вызова int(): обычные строки отсеиваются без исключения.
+    text = value.strip()
+    digits = text[1:] if text.startswith(("+", "-")) else text
+    if digits.isascii():
+        if digits.isdigit():
+            return int(text)
+        if "_" not in digits:
+            return None
+    # Редкие формы вроде 1_000 или цифр других алфавитов проверяет сам int().
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def combine(a: str, b: str) -> int | str:
+    """Сумма двух чисел или конкатенация, если хотя бы одно значение не число."""
+    c = to_int(a)
+    if c is not None:
+        d = to_int(b)
+        if d is not None:
+            return c + d
+    return f"{a}{b}"
+
+
+def process_lines(lines: Iterable[str], sep: str = "\t") -> list[str]:
+    """Обработка строк с парами значений, разделёнными sep."""
+    result = []
+    for line in lines:
+        a, _, b = line.rstrip("\r\n").partition(sep)
+        result.append(f"{combine(a, b)}\n")
+    return result
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    iterator = iter(lines)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_batch(source: TextIO, target: TextIO, sep: str = "\t", workers: int = 0, chunk_size: int = CHUNK_SIZE) -> None:
+    """Пакетная обработка пар из source с записью результатов в target."""
+    chunks = _chunks(source, chunk_size)
+    if workers > 1:
+        with Pool(workers) as pool:
+            for lines in pool.imap(_process_chunk, ((chunk, sep) for chunk in chunks)):
+                target.writelines(lines)
+    else:
+        for chunk in chunks:
+            target.writelines(process_lines(chunk, sep))
+    target.flush()
+
+
+def _process_chunk(args: tuple[list[str], str]) -> list[str]:
+    return process_lines(*args)
+
+
+def batch_main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Пакетное сложение или конкатенация пар значений")
+    parser.add_argument("--batch", action="store_true", help="Читать пары построчно из файла или stdin")
+    parser.add_argument("input", nargs="?", help="Файл с парами значений (по умолчанию stdin)")
+    parser.add_argument("-o", "--output", help="Файл для результатов (по умолчанию stdout)")
+    parser.add_argument("--sep", default="\t", help="Разделитель значений в строке")
+    parser.add_argument("--workers", type=int, default=0, help="Число процессов для обработки")
+    args = parser.parse_args(argv)
+
+    source = open(args.input, "r", encoding="utf-8") if args.input else sys.stdin
+    target = open(args.output, "w", encoding="utf-8", buffering=1 << 20) if args.output else sys.stdout
+    try:
+        run_batch(source, target, args.sep, args.workers)
+    finally:
+        if args.input:
+            source.close()
+        if args.output:
+            target.close()
+
 
 def main() -> None:
     result: int | str
@@ -24,4 +115,7 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    if "--batch" in sys.argv[1:]:
+        run_profiled(batch_main)
+    else:
+        run_profiled(main)
@@ -5,8 +5,33 @@
 # Пользователь может указать число строк и столбцов, а также диапазон целых чисел.
 # Произведите обработку ошибок ввода пользователя.
 
+import json
+import os
 import random
-from typing import Generator
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Generator, Iterable, Iterator, Optional, Sequence
+
+from profiler import run_profiled
+
+
+# NumPy необязателен: при его отсутствии статистика считается циклами по array.
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+# Заголовок двоичного файла матрицы: сигнатура, версия, строки, столбцы,
+# начало и конец диапазона, число строк в блоке.
+HEADER = struct.Struct("<4sHIIqqI")
+MAGIC = b"MTRX"
+VERSION = 1
+# Все элементы хранятся как 64-битные целые со знаком.
+ITEM = "q"
+ITEM_SIZE = array(ITEM).itemsize
+DEFAULT_BLOCK_ROWS = 1024
 
 
 class Matrix:
@@ -31,6 +56,60 @@ class Matrix:
         for name in ["rows", "columns"]:
             yield name, getattr(self, name)
 
+    def save_binary(self, path: Path, block_rows: int = DEFAULT_BLOCK_ROWS) -> None:
+        """Сохранение матрицы блоками фиксированной ширины с манифестом контрольных сумм."""
+        if block_rows <= 0:
+            raise NumberNotPositiveError("block_rows", block_rows)
+        if len(self.matrix) != self.rows or any(len(row) != self.columns for row in self.matrix):
+            raise ValueError("Размер матрицы не соответствует числу строк и столбцов")
+        checksums = []
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.rows, self.columns, self.start, self.end, block_rows))
+            for first in range(0, self.rows, block_rows):
+                block = array(ITEM)
+                for row in self.matrix[first : first + block_rows]:
+                    block.extend(row)
+                if sys.byteorder != "little":
+                    block.byteswap()
+                data = block.tobytes()
+                checksums.append(zlib.crc32(data))
+                file.write(data)
+        manifest = {
+            "rows": self.rows,
+            "columns": self.columns,
+            "start": self.start,
+            "end": self.end,
+            "block_rows": block_rows,
+            "crc32": checksums,
+        }
+        with open(manifest_path(path), "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+
+    @classmethod
+    def load_binary(cls, path: Path) -> "Matrix":
+        """Загрузка матрицы целиком из двоичного файла."""
+        with open(path, "rb") as file:
+            matrix = cls._read_header(file)
+        matrix.matrix = read_rows(path, 0, matrix.rows)
+        return matrix
+
+    @classmethod
+    def _read_header(cls, file: BinaryIO) -> "Matrix":
+        magic, version, rows, columns, start, end, _ = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Файл не является двоичной матрицей")
+        return cls(rows, columns, start, end)
+
+    def row_chunks(self, chunk_rows: int = DEFAULT_BLOCK_ROWS) -> Iterator[list[list[int]]]:
+        for first in range(0, len(self.matrix), chunk_rows):
+            yield self.matrix[first : first + chunk_rows]
+
+    def stats(self, chunk_rows: int = DEFAULT_BLOCK_ROWS, bins: Optional[int] = None) -> "MatrixStats":
+        """Статистика по матрице, посчитанная за один проход по блокам строк."""
+        stats = MatrixStats(self.columns, self.start, self.end, bins)
+        stats.consume(self.row_chunks(chunk_rows))
+        return stats
+
     def __str__(self) -> str:
         if not self.matrix:
             return "Матрица пока не сгенерирована"
@@ -40,6 +119,214 @@ class Matrix:
         return string
 
 
+def manifest_path(path: Path) -> Path:
+    """Путь к манифесту контрольных сумм двоичной матрицы."""
+    path = Path(path)
+    return path.with_name(path.name + ".crc")
+
+
+def load_manifest(path: Path) -> dict:
+    with open(manifest_path(path), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _read_block(file: BinaryIO, manifest: dict, index: int) -> bytes:
+    row_size = manifest["columns"] * ITEM_SIZE
+    first = index * manifest["block_rows"]
+    count = min(manifest["block_rows"], manifest["rows"] - first)
+    file.seek(HEADER.size + first * row_size)
+    return file.read(count * row_size)
+
+
+def _read_rows(file: BinaryIO, header: "Matrix", first: int, count: int) -> list[list[int]]:
+    first = max(first, 0)
+    count = max(min(count, header.rows - first), 0)
+    row_size = header.columns * ITEM_SIZE
+    file.seek(HEADER.size + first * row_size)
+    values = array(ITEM)
+    values.frombytes(file.read(count * row_size))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return [values[i : i + header.columns].tolist() for i in range(0, len(values), header.columns)]
+
+
+def read_rows(path: Path, first: int, count: int) -> list[list[int]]:
+    """Частичная загрузка строк матрицы: читаются только нужные строки."""
+    with open(path, "rb") as file:
+        return _read_rows(file, Matrix._read_header(file), first, count)
+
+
+def verify_binary(path: Path) -> list[int]:
+    """Проверка файла по манифесту, возвращает номера повреждённых блоков."""
+    manifest = load_manifest(path)
+    damaged = []
+    with open(path, "rb") as file:
+        header = Matrix._read_header(file)
+        if (header.rows, header.columns) != (manifest["rows"], manifest["columns"]):
+            raise ValueError("Заголовок файла не соответствует манифесту")
+        expected = HEADER.size + header.rows * header.columns * ITEM_SIZE
+        if os.fstat(file.fileno()).st_size != expected:
+            raise ValueError(f"Размер файла не соответствует заголовку: ожидалось {expected} байт")
+        for index, checksum in enumerate(manifest["crc32"]):
+            if zlib.crc32(_read_block(file, manifest, index)) != checksum:
+                damaged.append(index)
+    return damaged
+
+
+def diff_binary(first: Path, second: Path) -> list[int]:
+    """Номера различающихся блоков двух матриц, найденные только по манифестам."""
+    manifest_a = load_manifest(first)
+    manifest_b = load_manifest(second)
+    layout = ("rows", "columns", "block_rows")
+    if any(manifest_a[key] != manifest_b[key] for key in layout):
+        raise ValueError("Матрицы имеют разную структуру блоков")
+    return [
+        index for index, (crc_a, crc_b) in enumerate(zip(manifest_a["crc32"], manifest_b["crc32"])) if crc_a != crc_b
+    ]
+
+
+def read_block_rows(path: Path, index: int) -> list[list[int]]:
+    """Загрузка строк одного блока, например различающегося при сравнении."""
+    manifest = load_manifest(path)
+    first = index * manifest["block_rows"]
+    return read_rows(path, first, manifest["block_rows"])
+
+
+def iter_row_chunks(path: Path, chunk_rows: int = DEFAULT_BLOCK_ROWS) -> Iterator[list[list[int]]]:
+    """Последовательное чтение двоичной матрицы блоками строк."""
+    with open(path, "rb") as file:
+        header = Matrix._read_header(file)
+        for first in range(0, header.rows, chunk_rows):
+            yield _read_rows(file, header, first, chunk_rows)
+
+
+def stats_binary(path: Path, chunk_rows: int = DEFAULT_BLOCK_ROWS, bins: Optional[int] = None) -> "MatrixStats":
+    """Статистика по двоичной матрице без загрузки её в память целиком."""
+    with open(path, "rb") as file:
+        header = Matrix._read_header(file)
+    stats = MatrixStats(header.columns, header.start, header.end, bins)
+    stats.consume(iter_row_chunks(path, chunk_rows))
+    return stats
+
+
+class MatrixStats:
+    """Потоковые агрегаты по строкам, столбцам и всей матрице."""
+
+    def __init__(self, columns: int, start: int, end: int, bins: Optional[int] = None) -> None:
+        if start > end:
+            raise StartGreaterThanEndError(start, end)
+        self.columns = columns
+        self.start = start
+        self.end = end
+        self.width = end - start + 1
+        self.bins = bins or self.width
+        if self.bins <= 0:
+            raise NumberNotPositiveError("bins", self.bins)
+        self.count = 0
+        self.total = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+        self.row_sums: list[int] = []
+        self.row_min: list[int] = []
+        self.row_max: list[int] = []
+        self.column_sums = [0] * columns
+        self.column_min: list[Optional[int]] = [None] * columns
+        self.column_max: list[Optional[int]] = [None] * columns
+        self.histogram = [0] * self.bins
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def row_means(self) -> list[float]:
+        return [total / self.columns for total in self.row_sums]
+
+    @property
+    def column_means(self) -> list[Optional[float]]:
+        rows = len(self.row_sums)
+        return [total / rows if rows else None for total in self.column_sums]
+
+    def consume(self, chunks: Iterable[Sequence[Sequence[int]]]) -> None:
+        for chunk in chunks:
+            self.update(chunk)
+
+    def update(self, rows: Sequence[Sequence[int]]) -> None:
+        """Учёт очередного блока строк."""
+        if not len(rows):
+            return
+        if np is not None and self._fits_int64(len(rows)):
+            self._update_numpy(rows)
+        else:
+            self._update_array(rows)
+
+    def _fits_int64(self, rows: int) -> bool:
+        # Суммы блока и номера интервалов гистограммы должны помещаться в int64,
+        # иначе блок обрабатывается циклами с целыми числами Python.
+        limit = 2**63
+        largest = max(abs(self.start), abs(self.end))
+        return largest * rows * self.columns < limit and self.width * self.bins < limit
+
+    def _bin(self, value: int) -> int:
+        return (value - self.start) * self.bins // self.width
+
+    def _check_range(self, low: int, high: int) -> None:
+        if low < self.start or high > self.end:
+            raise ValueError(f"Значение вне диапазона {self.start}..{self.end}")
+
+    def _merge_global(self, total: int, low: int, high: int, count: int) -> None:
+        self.count += count
+        self.total += total
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    def _update_numpy(self, rows: Sequence[Sequence[int]]) -> None:
+        block = np.asarray(rows, dtype=np.int64)
+        if block.ndim != 2 or block.shape[1] != self.columns:
+            raise ValueError("Неверное количество столбцов в блоке")
+        row_min = block.min(axis=1)
+        row_max = block.max(axis=1)
+        self._check_range(int(row_min.min()), int(row_max.max()))
+        row_sums = block.sum(axis=1)
+        self._merge_global(int(row_sums.sum()), int(row_min.min()), int(row_max.max()), block.size)
+        self.row_sums.extend(row_sums.tolist())
+        self.row_min.extend(row_min.tolist())
+        self.row_max.extend(row_max.tolist())
+        self.column_sums = [a + b for a, b in zip(self.column_sums, block.sum(axis=0).tolist())]
+        self.column_min = [b if a is None else min(a, b) for a, b in zip(self.column_min, block.min(axis=0).tolist())]
+        self.column_max = [b if a is None else max(a, b) for a, b in zip(self.column_max, block.max(axis=0).tolist())]
+        indexes = (block - self.start) * self.bins // self.width
+        counts = np.bincount(indexes.ravel(), minlength=self.bins)
+        self.histogram = [a + b for a, b in zip(self.histogram, counts.tolist())]
+
+    def _update_array(self, rows: Sequence[Sequence[int]]) -> None:
+        column_sums = self.column_sums
+        column_min = self.column_min
+        column_max = self.column_max
+        histogram = self.histogram
+        for row in rows:
+            values = array(ITEM, row)
+            if len(values) != self.columns:
+                raise ValueError("Неверное количество столбцов в блоке")
+            low = min(values)
+            high = max(values)
+            self._check_range(low, high)
+            total = sum(values)
+            self._merge_global(total, low, high, len(values))
+            self.row_sums.append(total)
+            self.row_min.append(low)
+            self.row_max.append(high)
+            for j, value in enumerate(values):
+                column_sums[j] += value
+                current = column_min[j]
+                if current is None or value < current:
+                    column_min[j] = value
+                current = column_max[j]
+                if current is None or value > current:
+                    column_max[j] = value
+                histogram[self._bin(value)] += 1
+
+
 class StartGreaterThanEndError(Exception):
     def __init__(
         self,
@@ -88,4 +375,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_profiled(main)
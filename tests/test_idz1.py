@@ -6,7 +6,8 @@ from pathlib import Path
 
 import pytest
 
-from idz1 import Route, RouteManager
+import idz1
+from idz1 import Route, RouteGraph, RouteManager
 
 
 @pytest.fixture
@@ -101,3 +102,83 @@ def test_logging(temp_file: Path, caplog):
     with caplog.at_level("INFO"):
         RouteManager(temp_file)
     assert "Маршруты успешно загружены из файла." in caplog.text
+
+
+def test_route_graph_queries():
+    """Тестирование запросов к графу маршрутов."""
+    graph = RouteGraph(
+        [
+            Route("Москва", "Казань", "1"),
+            Route("Казань", "Уфа", "2"),
+            Route("Москва", "Уфа", "3"),
+            Route("Уфа", "Омск", "4"),
+        ]
+    )
+    assert graph.reachable("Москва") == {"Казань", "Уфа", "Омск"}
+    assert graph.reachable("Омск") == set()
+    assert [route.number for route in graph.shortest_path("Москва", "Омск")] == ["3", "4"]
+    assert graph.shortest_path("Омск", "Москва") is None
+    assert graph.shortest_path("Москва", "Москва") == ()
+    assert {route.number for route in graph.routes_at("Уфа")} == {"2", "3", "4"}
+
+
+def test_route_graph_updates_on_add(temp_file: Path):
+    """Тестирование обновления графа при добавлении маршрута."""
+    manager = RouteManager(temp_file)
+    manager.add_route("Москва", "Казань", "1")
+    assert manager.graph.shortest_path("Москва", "Сочи") is None
+    manager.add_route("Казань", "Сочи", "2")
+    assert [route.number for route in manager.graph.shortest_path("Москва", "Сочи")] == ["1", "2"]
+    assert manager.graph.reachable("Москва") == {"Казань", "Сочи"}
+
+
+def test_route_graph_cycles_and_immutable_results():
+    """Тестирование циклов и неизменяемости кэшированных результатов."""
+    graph = RouteGraph([Route("A", "B", "1"), Route("B", "A", "2"), Route("B", "C", "3")])
+    # В исходную остановку можно вернуться по циклу
+    assert graph.reachable("A") == {"A", "B", "C"}
+    assert graph.reachable("C") == set()
+    with pytest.raises(AttributeError):
+        graph.reachable("A").add("Z")
+    path = graph.shortest_path("A", "C")
+    assert isinstance(path, tuple)
+    assert [route.number for route in graph.shortest_path("A", "C")] == ["1", "3"]
+
+
+def test_route_graph_is_lazy(temp_file: Path):
+    """Тестирование построения графа только при первом обращении."""
+    manager = RouteManager(temp_file)
+    manager.add_route("Москва", "Казань", "1")
+    assert manager._graph is None
+    graph = manager.graph
+    assert manager.graph is graph
+    manager.add_route("Казань", "Сочи", "2")
+    assert graph.reachable("Москва") == {"Казань", "Сочи"}
+
+
+def test_route_graph_cache_is_bounded(monkeypatch: pytest.MonkeyPatch):
+    """Тестирование ограничения размера кэша запросов."""
+    monkeypatch.setattr("idz1.GRAPH_CACHE_SIZE", 2)
+    graph = RouteGraph([Route("A", "B", "1"), Route("B", "C", "2")])
+    graph.shortest_path("A", "B")
+    graph.shortest_path("A", "C")
+    graph.shortest_path("A", "B")
+    graph.shortest_path("B", "C")
+    assert list(graph._path_cache) == [("A", "B"), ("B", "C")]
+
+
+def test_main_reuses_snapshot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys):
+    """Тестирование повторного запуска без разбора неизменного файла."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    manager = RouteManager(tmp_path / "idz.json")
+    manager.add_route("Москва", "Казань", "1")
+    manager.save_routes()
+
+    calls = []
+    parse = idz1._parse_routes
+    monkeypatch.setattr("idz1._parse_routes", lambda data: calls.append(data) or parse(data))
+    monkeypatch.setattr("sys.argv", ["idz1.py", "--find", "1"])
+    idz1.main()
+    idz1.main()
+    assert calls == []
+    assert capsys.readouterr().out.count("Маршрут найден") == 2
@@ -7,6 +7,7 @@ from pathlib import Path
 
 import pytest
 
+import idz2
 from idz2 import FileManager, Logger, RouteManager
 
 
@@ -112,3 +113,19 @@ def test_save_routes_error(temp_file: Path, caplog):
     except PermissionError:
         # Если исключение возникло, проверим, что оно было зафиксировано в логах
         assert "Ошибка при сохранении данных" in caplog.text
+
+
+def test_main_does_not_rewrite_unchanged_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Тестирование запуска без изменения маршрутов: файл не перезаписывается."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    file_path = tmp_path / "idz.json"
+    RouteManager([{"start": "Москва", "end": "Казань", "number": "101"}]).save_routes(file_path)
+    mtime = file_path.stat().st_mtime_ns
+
+    calls = []
+    monkeypatch.setattr("idz2.json.loads", lambda data: calls.append(data) or json.JSONDecoder().decode(data.decode()))
+    monkeypatch.setattr("sys.argv", ["idz2.py", "--number", "101"])
+    idz2.main()
+    idz2.main()
+    assert calls == []
+    assert file_path.stat().st_mtime_ns == mtime
@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import io
 import logging
+import xml.etree.ElementTree as ET
 from datetime import date
 from pathlib import Path
 
 import pytest
 
-from primer1 import IllegalYearError, Staff, UnknownCommandError, Worker
+from primer1 import (
+    IllegalYearError,
+    ScriptRunner,
+    Staff,
+    UnknownCommandError,
+    Worker,
+    execute,
+    parse_add_args,
+    parse_query,
+    run_script,
+)
 
 
 @pytest.fixture
@@ -105,3 +117,198 @@ def test_logging_error(caplog):
         except IllegalYearError as e:
             logging.error(f"Ошибка: {e}")
     assert "Ошибка: -1 -> Illegal year number" in caplog.text
+
+
+@pytest.fixture
+def staff_for_query():
+    """Фикстура с работниками для проверки запросов."""
+    staff = Staff()
+    staff.add("Сидоров С.С.", "Инженер", 2015)
+    staff.add("Иванов И.И.", "Инженер", 2005)
+    staff.add("Петров П.П.", "Менеджер", 2010)
+    staff.add("Иваненко А.А.", "Менеджер", 2020)
+    return staff
+
+
+def test_add_keeps_name_order(staff_for_query):
+    """Тестирование сохранения порядка по имени при добавлении."""
+    names = [worker.name for worker in staff_for_query.workers]
+    assert names == sorted(names)
+
+
+def test_query_filters(staff_for_query):
+    """Тестирование фильтров запроса."""
+    query = staff_for_query.query()
+    assert [w.name for w in query.where_name("Иван")] == ["Иваненко А.А.", "Иванов И.И."]
+    assert [w.name for w in query.where_post("Инженер")] == ["Иванов И.И.", "Сидоров С.С."]
+    assert [w.name for w in query.where_year(2006, 2016)] == ["Петров П.П.", "Сидоров С.С."]
+    assert list(query.where_name("Яковлев")) == []
+
+
+def test_query_order_and_paging(staff_for_query):
+    """Тестирование сортировки и постраничного вывода."""
+    query = staff_for_query.query().order_by("year")
+    assert [w.year for w in query] == [2005, 2010, 2015, 2020]
+    assert [w.year for w in query.page(2, 2)] == [2015, 2020]
+    assert [w.year for w in query.order_by("year", descending=True).take(1)] == [2020]
+    assert [w.name for w in staff_for_query.query().order_by("name", descending=True).skip(3)] == ["Иваненко А.А."]
+    with pytest.raises(ValueError):
+        query.order_by("salary")
+
+
+def test_query_is_lazy(staff_for_query):
+    """Тестирование ленивого выполнения запроса."""
+    result = iter(staff_for_query.query())
+    assert next(result).name == "Иваненко А.А."
+
+
+def test_parse_query(staff_for_query):
+    """Тестирование разбора параметров команды query."""
+    query = parse_query(staff_for_query, "post=Менеджер year=2000- order=year desc limit=1")
+    assert [w.name for w in query] == ["Иваненко А.А."]
+    with pytest.raises(ValueError):
+        parse_query(staff_for_query, "salary=100")
+
+
+def test_save_matches_element_tree(temp_file, staff_with_data):
+    """Тестирование совпадения формата сохранения с ElementTree."""
+    staff_with_data.add("A&<B>", "Инженер", 2001)
+    staff_with_data.save(temp_file)
+    root = ET.Element("workers")
+    for worker in staff_with_data.workers:
+        worker_element = ET.SubElement(root, "worker")
+        ET.SubElement(worker_element, "name").text = worker.name
+        ET.SubElement(worker_element, "post").text = worker.post
+        ET.SubElement(worker_element, "year").text = str(worker.year)
+    expected = temp_file.with_suffix(".expected")
+    with open(expected, "wb") as fout:
+        ET.ElementTree(root).write(fout, encoding="utf8", xml_declaration=True)
+    assert temp_file.read_bytes() == expected.read_bytes()
+
+
+def test_parse_add_args():
+    """Тестирование разбора аргументов команды add."""
+    assert parse_add_args("Иванов И.И. Инженер 2005") == ("Иванов И.И.", "Инженер", 2005)
+    assert parse_add_args('"Иванов И.И." "Старший инженер" 2005') == ("Иванов И.И.", "Старший инженер", 2005)
+    with pytest.raises(ValueError):
+        parse_add_args("Иванов 2005")
+
+
+def test_execute_dispatch(capsys):
+    """Тестирование выполнения команд через таблицу команд."""
+    staff = Staff()
+    execute(staff, "ADD Иванов И.И. Инженер 2005")
+    assert staff.workers == [Worker(name="Иванов И.И.", post="Инженер", year=2005)]
+    with pytest.raises(UnknownCommandError):
+        execute(staff, "bogus")
+
+
+def test_script_runner(temp_file, capsys):
+    """Тестирование пакетного выполнения сценария."""
+    staff = Staff()
+    script = [
+        "add Петров П.П. Менеджер 2010\n",
+        "add\n",
+        "Иванов И.И.\n",
+        "Инженер\n",
+        "2005\n",
+        f"save {temp_file}\n",
+        "add Сидоров С.С. Инженер 3000\n",
+        "query post=Инженер\n",
+        "bogus\n",
+    ]
+    errors = ScriptRunner(staff).run(script)
+    assert errors == 2
+    captured = capsys.readouterr()
+    assert "Иванов И.И." in captured.out
+    assert "7: 3000 -> Illegal year number" in captured.err
+    assert "9: bogus -> Unknown command" in captured.err
+
+    # Сохранение выполняется в конце сценария
+    loaded = Staff()
+    loaded.load(temp_file)
+    assert [worker.name for worker in loaded.workers] == ["Иванов И.И.", "Петров П.П."]
+
+
+def test_script_runner_checkpoint(temp_file):
+    """Тестирование явной контрольной точки сохранения."""
+    staff = Staff()
+    runner = ScriptRunner(staff)
+    runner.run([f"save {temp_file}", "add Иванов И.И. Инженер 2005", "checkpoint", "exit"])
+    loaded = Staff()
+    loaded.load(temp_file)
+    assert len(loaded.workers) == 1
+
+
+def test_query_order_without_limit():
+    """Тестирование сортировки по году без лимита и со смещением."""
+    staff = Staff()
+    for idx, year in enumerate([2003, 2001, 2003, 2000, 2002]):
+        staff.add(f"Работник {idx}", "Инженер", year)
+    years = [worker.year for worker in staff.query().order_by("year")]
+    assert years == [2000, 2001, 2002, 2003, 2003]
+    years = [worker.year for worker in staff.query().order_by("year", descending=True).skip(1)]
+    assert years == [2003, 2002, 2001, 2000]
+
+
+def test_script_runner_save_target_change(tmp_path: Path):
+    """Тестирование сохранения в прежний файл при смене файла сохранения."""
+    first = tmp_path / "a.xml"
+    second = tmp_path / "b.xml"
+    staff = Staff()
+    ScriptRunner(staff).run(
+        [
+            "add Иванов И.И. Инженер 2005",
+            f"save {first}",
+            f"save {second}",
+            "add Петров П.П. Менеджер 2010",
+        ]
+    )
+    loaded = Staff()
+    loaded.load(first)
+    assert [worker.name for worker in loaded.workers] == ["Иванов И.И."]
+    loaded.load(second)
+    assert len(loaded.workers) == 2
+
+
+def test_run_script_without_fileno(monkeypatch):
+    """Тестирование сценария при выводе в поток без файлового дескриптора."""
+    out = io.StringIO()
+    monkeypatch.setattr("sys.stdout", out)
+    assert run_script(Staff(), ["add Иванов И.И. Инженер 2005", "list"]) == 0
+    assert "Иванов И.И." in out.getvalue()
+
+
+def test_script_runner_save_before_load(tmp_path: Path):
+    """Тестирование сохранения отложенных изменений перед загрузкой файла."""
+    out = tmp_path / "out.xml"
+    other = tmp_path / "other.xml"
+    old = Staff()
+    old.add("Old", "eng", 2000)
+    old.save(other)
+
+    staff = Staff()
+    errors = ScriptRunner(staff).run(["add A eng 2005", f"save {out}", f"load {other}", "add B eng 2006"])
+    assert errors == 0
+    loaded = Staff()
+    loaded.load(out)
+    assert [worker.name for worker in loaded.workers] == ["A"]
+
+
+def test_script_runner_save_errors(tmp_path: Path, capsys):
+    """Тестирование ошибок сохранения в режиме сценария."""
+    missing = tmp_path / "missing" / "x.xml"
+    errors = ScriptRunner(Staff()).run(["add A eng 2005", f"save {missing}"])
+    assert errors == 1
+    assert "2: " in capsys.readouterr().err
+
+    # Ошибка при отложенной записи учитывается по строке команды save
+    target = tmp_path / "x.xml"
+    runner = ScriptRunner(Staff())
+    runner.run([f"save {target}", "add A eng 2005"])
+    target.unlink()
+    target.mkdir()
+    runner.save_path = str(target)
+    runner.checkpoint()
+    assert runner.errors == 1
+    assert "1: " in capsys.readouterr().err
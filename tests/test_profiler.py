@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pstats
+from pathlib import Path
+
+import pytest
+
+from profiler import PROFILE_ENV, CommandTimer, pop_profile_arg, run_profiled
+
+
+def test_pop_profile_arg():
+    """Тестирование извлечения флага --profile из аргументов."""
+    argv = ["idz1.py", "--profile", "out.pstats", "--find", "5"]
+    assert pop_profile_arg(argv) == "out.pstats"
+    assert argv == ["idz1.py", "--find", "5"]
+
+    argv = ["idz1.py", "--profile=out.folded"]
+    assert pop_profile_arg(argv) == "out.folded"
+    assert argv == ["idz1.py"]
+
+    argv = ["idz1.py", "--profile", "--find", "5"]
+    assert pop_profile_arg(argv) == "idz1.pstats"
+    assert argv == ["idz1.py", "--find", "5"]
+
+    assert pop_profile_arg(["idz1.py", "--find", "5"]) is None
+
+
+def test_run_profiled_disabled(monkeypatch: pytest.MonkeyPatch):
+    """Тестирование запуска без профилирования."""
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    assert run_profiled(lambda: 42, ["prog"]) == 42
+
+
+def test_run_profiled_pstats(tmp_path: Path):
+    """Тестирование записи статистики cProfile."""
+    path = tmp_path / "out.pstats"
+    assert run_profiled(lambda: sum(range(1000)), ["prog", "--profile", str(path)]) == 499500
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_run_profiled_folded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Тестирование семплирующего профилировщика через переменную окружения."""
+    path = tmp_path / "out.folded"
+    monkeypatch.setenv(PROFILE_ENV, str(path))
+
+    def work():
+        total = 0
+        for i in range(300000):
+            total += i * i
+        return total
+
+    run_profiled(work, ["prog"])
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_command_timer():
+    """Тестирование замера времени команд."""
+    timer = CommandTimer()
+
+    @timer.timed
+    def command():
+        return "ok"
+
+    assert command() == "ok"
+    assert timer.stats == {}
+
+    timer.enabled = True
+    command()
+    command()
+    assert timer.stats["command"][0] == 2
+    assert "command" in timer.report()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from idz1 import Route
+from shared_routes import SharedRouteTable, publish_routes
+
+
+@pytest.fixture
+def table_file(tmp_path: Path) -> Path:
+    """Фикстура для файла общей таблицы маршрутов."""
+    return tmp_path / "idz.routes"
+
+
+@pytest.fixture
+def routes():
+    """Фикстура со списком маршрутов."""
+    return [
+        Route("Москва", "Казань", "202"),
+        Route("Сочи", "Краснодар", "101"),
+        Route("Омск", "Томск", "202"),
+        Route("Уфа", "Пермь", "303"),
+    ]
+
+
+def _find_in_child(path, number, queue):
+    with SharedRouteTable(path) as table:
+        route = table.find_route(number)
+    queue.put(route.to_dict() if route else None)
+
+
+def test_publish_and_find(table_file: Path, routes):
+    """Тестирование публикации и поиска маршрутов."""
+    assert publish_routes(routes, table_file) == 1
+    with SharedRouteTable(table_file) as table:
+        assert len(table) == 4
+        route = table.find_route("202")
+        assert route is not None
+        # При повторе номера возвращается маршрут, добавленный первым
+        assert route.to_dict() == {"start": "Москва", "end": "Казань", "number": "202"}
+        assert table.find_route("303").start == "Уфа"
+        assert table.find_route("999") is None
+        assert [route.number for route in table] == ["101", "202", "202", "303"]
+
+
+def test_publish_empty(table_file: Path):
+    """Тестирование публикации пустой таблицы."""
+    publish_routes([], table_file)
+    with SharedRouteTable(table_file) as table:
+        assert len(table) == 0
+        assert table.find_route("1") is None
+
+
+def test_refresh_generation(table_file: Path, routes):
+    """Тестирование перехода читателя на новое поколение таблицы."""
+    publish_routes(routes, table_file)
+    with SharedRouteTable(table_file) as table:
+        assert table.refresh() is False
+        assert publish_routes(routes + [Route("Чита", "Иркутск", "404")], table_file) == 2
+        # До обновления читатель видит прежнее поколение
+        assert table.find_route("404") is None
+        assert table.refresh() is True
+        assert table.generation == 2
+        assert table.find_route("404").start == "Чита"
+
+
+def test_invalid_table(table_file: Path):
+    """Тестирование подключения к файлу другого формата."""
+    table_file.write_bytes(b"not a route table at all")
+    with pytest.raises(ValueError):
+        SharedRouteTable(table_file)
+
+
+def test_reader_process(table_file: Path, routes):
+    """Тестирование чтения таблицы из другого процесса."""
+    publish_routes(routes, table_file)
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_find_in_child, args=(table_file, "101", queue))
+    process.start()
+    result = queue.get(timeout=10)
+    process.join()
+    assert result == {"start": "Сочи", "end": "Краснодар", "number": "101"}
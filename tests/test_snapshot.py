@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import idz1
+import idz2
+from primer1 import Staff
+from snapshot import SnapshotCache
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Фикстура для исходного файла."""
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps([1, 2, 3]), encoding="utf-8")
+    return path
+
+
+def test_snapshot_hit_and_invalidation(source: Path):
+    """Тестирование повторного использования и сброса снимка."""
+    cache = SnapshotCache()
+    calls = []
+
+    def parse(data: bytes):
+        calls.append(data)
+        return json.loads(data)
+
+    assert cache.load(source, parse, "test") == [1, 2, 3]
+    assert cache.load(source, parse, "test") == [1, 2, 3]
+    assert len(calls) == 1
+    assert cache.entry_path(source, "test").exists()
+
+    # Изменение файла приводит к повторному разбору
+    source.write_text(json.dumps([4]), encoding="utf-8")
+    assert cache.load(source, parse, "test") == [4]
+    assert len(calls) == 2
+
+    cache.invalidate(source, "test")
+    assert cache.load(source, parse, "test") == [4]
+    assert len(calls) == 3
+
+
+def test_snapshot_same_stat_different_content(source: Path):
+    """Тестирование проверки хэша при совпадении размера и времени изменения."""
+    cache = SnapshotCache()
+    cache.load(source, json.loads, "test")
+    stat = source.stat()
+    source.write_text(json.dumps([7, 8, 9]), encoding="utf-8")
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.load(source, json.loads, "test") == [7, 8, 9]
+
+
+def test_snapshot_corrupted_entry(source: Path):
+    """Тестирование пересоздания поврежденного снимка."""
+    cache = SnapshotCache()
+    cache.load(source, json.loads, "test")
+    cache.entry_path(source, "test").write_bytes(b"garbage")
+    assert cache.load(source, json.loads, "test") == [1, 2, 3]
+
+
+def test_snapshot_eviction(tmp_path: Path):
+    """Тестирование вытеснения снимков при превышении лимита."""
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text("[1]", encoding="utf-8")
+    second.write_text("[2]", encoding="utf-8")
+
+    # Лимит вмещает только один снимок
+    probe = SnapshotCache(cache_dir=tmp_path / "probe")
+    probe.load(first, json.loads, "test")
+    size = probe.entry_path(first, "test").stat().st_size
+    cache = SnapshotCache(cache_dir=tmp_path / "cache", max_bytes=size + size // 2)
+
+    cache.load(first, json.loads, "test")
+    cache.load(second, json.loads, "test")
+    assert not cache.entry_path(first, "test").exists()
+    assert cache.entry_path(second, "test").exists()
+
+    calls = []
+    assert cache.load(second, lambda data: calls.append(data), "test") == [2]
+    assert calls == []
+
+
+def test_snapshot_larger_than_limit(source: Path):
+    """Тестирование отказа от сохранения снимка больше лимита."""
+    cache = SnapshotCache(max_bytes=1)
+    assert cache.load(source, json.loads, "test") == [1, 2, 3]
+    assert not cache.entry_path(source, "test").exists()
+
+
+def test_staff_load_uses_snapshot(tmp_path: Path):
+    """Тестирование загрузки сотрудников через снимок."""
+    path = tmp_path / "workers.xml"
+    staff = Staff()
+    staff.add("Петров П.П.", "Менеджер", 2010)
+    staff.add("Иванов И.И.", "Инженер", 2005)
+    staff.save(path)
+
+    for _ in range(2):
+        loaded = Staff()
+        loaded.load(path)
+        assert loaded.workers == staff.workers
+
+
+def test_snapshot_kinds_are_separate(tmp_path: Path):
+    """Тестирование раздельных снимков idz1 и idz2 для одного файла."""
+    path = tmp_path / "idz.json"
+    path.write_text(json.dumps([{"start": "A", "end": "B", "number": "1"}]), encoding="utf-8")
+    assert idz1.RouteManager(path).find_route("1").start == "A"
+    routes = idz2.FileManager.load_routes(path)
+    assert routes == [{"start": "A", "end": "B", "number": "1"}]
+    assert idz2.RouteManager(routes).find_route("1")["end"] == "B"
+    assert idz1.RouteManager(path).routes[0].number == "1"
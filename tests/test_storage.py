@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from primer1 import IllegalYearError, Staff
+from storage import SqliteRouteManager, SqliteStaff
+
+
+@pytest.fixture
+def db_file(tmp_path: Path) -> Path:
+    """Фикстура для временной базы данных."""
+    return tmp_path / "data.sqlite"
+
+
+def test_route_manager_add_and_find(db_file: Path):
+    """Тестирование добавления и поиска маршрутов в базе."""
+    manager = SqliteRouteManager(db_file)
+    manager.add_route("Москва", "Казань", "101")
+    manager.add_route("Казань", "Уфа", "202")
+    with pytest.raises(ValueError, match="Номер маршрута должен быть числом."):
+        manager.add_route("Москва", "Сочи", "ABC")
+    manager.close()
+
+    manager = SqliteRouteManager(db_file)
+    route = manager.find_route("202")
+    assert route is not None
+    assert (route.start, route.end) == ("Казань", "Уфа")
+    assert manager.find_route("999") is None
+    assert {route.number for route in manager.routes_at("Казань")} == {"101", "202"}
+    assert [route.number for route in manager.graph.shortest_path("Москва", "Уфа")] == ["101", "202"]
+    journal = manager.connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal == "wal"
+    manager.close()
+
+
+def test_route_manager_import_export(db_file: Path, tmp_path: Path):
+    """Тестирование импорта и экспорта маршрутов в JSON."""
+    data = [
+        {"start": "Москва", "end": "Казань", "number": "101"},
+        {"start": "Сочи", "end": "Краснодар", "number": "202"},
+    ]
+    source = tmp_path / "routes.json"
+    source.write_text(json.dumps(data), encoding="utf-8")
+    manager = SqliteRouteManager(db_file)
+    assert manager.import_json(source) == 2
+
+    target = tmp_path / "export.json"
+    manager.export_json(target)
+    assert json.loads(target.read_text(encoding="utf-8")) == data
+    manager.close()
+
+
+def test_staff_add_and_select(db_file: Path):
+    """Тестирование добавления и выбора сотрудников в базе."""
+    staff = SqliteStaff(db_file)
+    staff.add("Петров П.П.", "Менеджер", 2010)
+    staff.add("Иванов И.И.", "Инженер", 2005)
+    with pytest.raises(IllegalYearError):
+        staff.add("Сидоров С.С.", "Инженер", date.today().year + 1)
+    assert [worker.name for worker in staff.workers] == ["Иванов И.И.", "Петров П.П."]
+    period = date.today().year - 2008
+    assert [worker.name for worker in staff.select(period)] == ["Иванов И.И."]
+    staff.close()
+
+
+def test_staff_import_export(db_file: Path, tmp_path: Path):
+    """Тестирование импорта и экспорта сотрудников в XML."""
+    source = tmp_path / "workers.xml"
+    original = Staff()
+    original.add("Иванов И.И.", "Инженер", 2005)
+    original.save(source)
+
+    staff = SqliteStaff(db_file)
+    assert staff.import_xml(source) == 1
+    target = tmp_path / "export.xml"
+    staff.export_xml(target)
+    loaded = Staff()
+    loaded.load(target)
+    assert loaded.workers == original.workers
+    staff.close()
+
+
+def test_route_manager_graph_is_cached(db_file: Path, tmp_path: Path):
+    """Тестирование однократного построения и обновления графа маршрутов."""
+    manager = SqliteRouteManager(db_file)
+    manager.add_route("Москва", "Казань", "101")
+    graph = manager.graph
+    assert manager.graph is graph
+    manager.add_route("Казань", "Уфа", "202")
+    source = tmp_path / "routes.json"
+    source.write_text(json.dumps([{"start": "Уфа", "end": "Омск", "number": "303"}]), encoding="utf-8")
+    manager.import_json(source)
+    assert manager.graph is graph
+    assert [route.number for route in graph.shortest_path("Москва", "Омск")] == ["101", "202", "303"]
+    manager.close()
+
+
+def test_route_manager_routes_at_keeps_duplicates(db_file: Path):
+    """Тестирование выдачи одинаковых маршрутов через пункт."""
+    manager = SqliteRouteManager(db_file)
+    manager.add_route("Москва", "Казань", "101")
+    manager.add_route("Москва", "Казань", "101")
+    manager.add_route("Казань", "Казань", "202")
+    assert [route.number for route in manager.routes_at("Москва")] == ["101", "101"]
+    assert [route.number for route in manager.routes_at("Казань")] == ["101", "101", "202"]
+    manager.close()
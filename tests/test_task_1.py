@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import io
+from pathlib import Path
 from typing import Any
 
 import pytest
 
-from task_1 import main
+from task_1 import batch_main, combine, main, run_batch
 
 
 def test_main(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[Any]) -> None:
@@ -22,3 +24,45 @@ def test_main(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[Any
 
     captured = capsys.readouterr()
     assert captured.out == "Результат: a100\n"
+
+
+def test_combine() -> None:
+    assert combine("42", "100") == 142
+    assert combine("-5", " 7") == 2
+    assert combine("a", "100") == "a100"
+    assert combine("²", "1") == "²1"
+    assert combine("", "") == ""
+    assert combine("+1", "1_0") == 11
+    assert combine("٣", "1") == 4
+
+
+def test_combine_non_numeric_does_not_call_int(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def spy(value: str) -> int:
+        calls.append(value)
+        return builtin_int(value)
+
+    builtin_int = int
+    monkeypatch.setattr("task_1.int", spy, raising=False)
+    assert combine("abc", "1") == "abc1"
+    assert combine("1", "-") == "1-"
+    assert combine("12a", " x ") == "12a x "
+    assert calls == ["1"]
+    assert combine("+7", "1_000") == 1007
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_run_batch(workers: int) -> None:
+    source = io.StringIO("1\t2\na\tb\n10\tx\n-3\t3\n")
+    target = io.StringIO()
+    run_batch(source, target, workers=workers, chunk_size=2)
+    assert target.getvalue() == "3\nab\n10x\n0\n"
+
+
+def test_batch_main(tmp_path: Path) -> None:
+    source = tmp_path / "pairs.txt"
+    target = tmp_path / "result.txt"
+    source.write_text("1;2\nfoo;1\n", encoding="utf-8")
+    batch_main(["--batch", str(source), "-o", str(target), "--sep", ";"])
+    assert target.read_text(encoding="utf-8") == "3\nfoo1\n"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from pathlib import Path
+
+import pytest
+
+from task_2 import (
+    Matrix,
+    NumberNotPositiveError,
+    StartGreaterThanEndError,
+    diff_binary,
+    read_rows,
+    stats_binary,
+    verify_binary,
+)
+
+
+@pytest.fixture
+def matrix() -> Matrix:
+    """Фикстура для сгенерированной матрицы."""
+    matrix = Matrix(10, 4, -50, 50)
+    matrix.generate_matrix()
+    return matrix
+
+
+def test_generate_matrix(matrix: Matrix) -> None:
+    """Тестирование генерации матрицы."""
+    assert len(matrix.matrix) == 10
+    assert all(len(row) == 4 for row in matrix.matrix)
+    assert all(-50 <= value <= 50 for row in matrix.matrix for value in row)
+
+
+def test_generate_matrix_errors() -> None:
+    """Тестирование ошибок генерации матрицы."""
+    with pytest.raises(NumberNotPositiveError):
+        Matrix(0, 3, 1, 2).generate_matrix()
+    with pytest.raises(StartGreaterThanEndError):
+        Matrix(3, 3, 5, 1).generate_matrix()
+
+
+def test_binary_round_trip(matrix: Matrix, tmp_path: Path) -> None:
+    """Тестирование сохранения и загрузки двоичной матрицы."""
+    path = tmp_path / "matrix.bin"
+    matrix.save_binary(path, block_rows=3)
+    loaded = Matrix.load_binary(path)
+    assert (loaded.rows, loaded.columns, loaded.start, loaded.end) == (10, 4, -50, 50)
+    assert loaded.matrix == matrix.matrix
+    assert read_rows(path, 8, 5) == matrix.matrix[8:]
+    assert verify_binary(path) == []
+
+
+def test_binary_verify_and_diff(matrix: Matrix, tmp_path: Path) -> None:
+    """Тестирование проверки контрольных сумм и сравнения блоков."""
+    first = tmp_path / "first.bin"
+    second = tmp_path / "second.bin"
+    matrix.save_binary(first, block_rows=3)
+    matrix.matrix[4][0] += 1
+    matrix.save_binary(second, block_rows=3)
+    assert diff_binary(first, second) == [1]
+
+    # Порча данных в последнем блоке обнаруживается при проверке
+    with open(first, "r+b") as file:
+        file.seek(-1, 2)
+        last = file.read(1)[0]
+        file.seek(-1, 2)
+        file.write(bytes([last ^ 0xFF]))
+    assert verify_binary(first) == [3]
+
+
+def _check_stats(matrix: Matrix, stats) -> None:
+    values = [value for row in matrix.matrix for value in row]
+    assert stats.count == len(values)
+    assert stats.total == sum(values)
+    assert (stats.minimum, stats.maximum) == (min(values), max(values))
+    assert stats.mean == pytest.approx(sum(values) / len(values))
+    assert stats.row_sums == [sum(row) for row in matrix.matrix]
+    assert stats.row_max == [max(row) for row in matrix.matrix]
+    assert stats.column_sums == [sum(column) for column in zip(*matrix.matrix)]
+    assert stats.column_min == [min(column) for column in zip(*matrix.matrix)]
+    assert sum(stats.histogram) == len(values)
+
+
+def test_matrix_stats(matrix: Matrix) -> None:
+    """Тестирование потоковой статистики по матрице."""
+    stats = matrix.stats(chunk_rows=3)
+    _check_stats(matrix, stats)
+    assert len(stats.histogram) == 101
+    assert stats.histogram[0] == sum(row.count(-50) for row in matrix.matrix)
+
+
+def test_matrix_stats_without_numpy(matrix: Matrix, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тестирование статистики без NumPy."""
+    monkeypatch.setattr("task_2.np", None)
+    stats = matrix.stats(chunk_rows=4, bins=10)
+    _check_stats(matrix, stats)
+    assert len(stats.histogram) == 10
+
+
+def test_stats_binary(matrix: Matrix, tmp_path: Path) -> None:
+    """Тестирование статистики по двоичному файлу блоками строк."""
+    path = tmp_path / "matrix.bin"
+    matrix.save_binary(path)
+    _check_stats(matrix, stats_binary(path, chunk_rows=3))
+
+
+def test_binary_size_checks(matrix: Matrix, tmp_path: Path) -> None:
+    """Тестирование проверки размеров при сохранении и проверке файла."""
+    path = tmp_path / "matrix.bin"
+    with pytest.raises(ValueError):
+        Matrix(5, 3, 0, 9).save_binary(path)
+    matrix.matrix[0].append(1)
+    with pytest.raises(ValueError):
+        matrix.save_binary(path)
+    matrix.matrix[0].pop()
+
+    matrix.save_binary(path, block_rows=3)
+    with open(path, "r+b") as file:
+        file.truncate(path.stat().st_size - 8)
+    with pytest.raises(ValueError):
+        verify_binary(path)
+
+
+def _stats_values(stats) -> tuple:
+    return (
+        stats.count,
+        stats.total,
+        stats.minimum,
+        stats.maximum,
+        stats.row_sums,
+        stats.row_min,
+        stats.row_max,
+        stats.column_sums,
+        stats.column_min,
+        stats.column_max,
+        stats.histogram,
+    )
+
+
+def test_matrix_stats_numpy_matches_array(matrix: Matrix, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Тестирование совпадения результатов NumPy и циклов по array."""
+    pytest.importorskip("numpy")
+    with_numpy = matrix.stats(chunk_rows=3, bins=7)
+    monkeypatch.setattr("task_2.np", None)
+    without_numpy = matrix.stats(chunk_rows=3, bins=7)
+    assert _stats_values(with_numpy) == _stats_values(without_numpy)
+
+
+def test_matrix_stats_large_values() -> None:
+    """Тестирование точных сумм при значениях, близких к границам int64."""
+    matrix = Matrix(3, 4, -(2**62), 2**62)
+    matrix.matrix = [[2**62] * 4, [2**62 - 1] * 4, [-(2**62)] * 4]
+    stats = matrix.stats(chunk_rows=2, bins=4)
+    assert stats.row_sums == [2**64, 2**64 - 4, -(2**64)]
+    assert stats.column_sums == [2**62 - 1] * 4
+    assert stats.total == 4 * (2**62 - 1)
+    assert stats.histogram == [4, 0, 0, 8]